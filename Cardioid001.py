@@ -1,62 +1,8 @@
-import cv2
-import numpy as np
-import math
-import random
+from curvas.render import render
 
 # Video settings
-width, height = 1920, 1080  # Resolution
 fps = 60                   # Frames per second
 duration = 10              # Duration in seconds
-output_file = 'cardioid_curve.mp4'
+output_file = 'cardioid_curve_{seed}.mp4'  # Seed of the render
 
-# Video writer setup
-fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-video_writer = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
-
-# Time and scale settings
-t_max = duration * fps     # Total number of frames
-scale = 300                # Scale factor for curve rendering
-center = (width // 2, height // 2)
-
-# Cardioid Curve parameters
-a = random.uniform(100, 300)  # Radius of the cardioid
-
-# Function to compute Cardioid curve coordinates
-def cardioid_curve(t):
-    x = a * (1 - math.cos(t)) * math.cos(t)
-    y = a * (1 - math.cos(t)) * math.sin(t)
-    return x, y
-
-# Framebuffer
-points = []  # Store curve points incrementally
-for i in range(t_max):
-    frame = np.ones((height, width, 3), dtype=np.uint8) * 255  # White background
-    
-    # Compute the next point
-    t = 2 * math.pi * (i / t_max)  # Full rotation
-    x, y = cardioid_curve(t)
-    x_pixel = int(center[0] + x)
-    y_pixel = int(center[1] - y)
-    
-    if 0 <= x_pixel < width and 0 <= y_pixel < height:
-        points.append((x_pixel, y_pixel))
-    
-    # Draw the curve incrementally
-    for j in range(1, len(points)):
-        cv2.line(frame, points[j-1], points[j], (0, 0, 0), 1)
-    
-    # Draw axes
-    cv2.line(frame, (0, center[1]), (width, center[1]), (200, 200, 200), 1)
-    cv2.line(frame, (center[0], 0), (center[0], height), (200, 200, 200), 1)
-
-    # Display the frame
-    cv2.imshow('Cardioid Curve', frame)
-    video_writer.write(frame)
-    
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
-
-# Clean up
-video_writer.release()
-cv2.destroyAllWindows()
-print(f'Video saved as {output_file}')
+render('cardioid', fps=fps, duration=duration, style='plain', output_file=output_file)
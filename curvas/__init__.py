@@ -0,0 +1 @@
+# Shared rendering helpers for the curve animation scripts
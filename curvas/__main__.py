@@ -0,0 +1,3 @@
+from curvas.cli import main
+
+main()
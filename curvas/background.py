@@ -0,0 +1,19 @@
+import cv2
+import numpy as np
+
+# Gradient backgrounds already built, keyed by (width, height, colormap)
+_backgrounds = {}
+
+
+# Vertical gradient run through an OpenCV colormap.
+# The image is built once per key and the same read-only buffer is handed
+# out afterwards; callers that draw on it must take a copy.
+def gradient_background(width, height, colormap):
+    key = (width, height, colormap)
+    background = _backgrounds.get(key)
+    if background is None:
+        gradient = np.linspace(0, 255, height, dtype=np.uint8)
+        background = cv2.applyColorMap(np.tile(gradient, (width, 1)).T, colormap)
+        background.flags.writeable = False
+        _backgrounds[key] = background
+    return background
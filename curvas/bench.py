@@ -0,0 +1,84 @@
+"""
+Segment throughput of the drawing layer: one cv2.line call per segment
+against batched cv2.polylines calls, on the curves of the Epicycloid and
+Hypotrochoid scripts clipped to the frame.
+
+    python -m curvas.bench [--segments N] [--resolution WxH] [--thickness T]
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from curvas.cli import resolution
+from curvas.clip import path_segments
+from curvas.colors import palette_table
+from curvas.layer import CurveLayer
+from curvas.registry import get_curve
+
+# Curves as the scripts draw them: many loops, at the scale the scripts use
+CASES = [
+    ('epicycloid', dict(R=120, r=35), 100, 2 * math.pi / 60 / 5),
+    ('hypotrochoid', dict(R=200, r=70, d=120), 1, 2 * math.pi / 60),
+]
+
+
+# Colors of each run: a single color, a sweep palette, the same in 256 bands
+def color_tables(n):
+    sweep = palette_table('sweep', n)
+    band = -(-n // 256)
+    return {
+        'single color': np.zeros((n, 3), dtype=np.uint8),
+        'sweep': sweep,
+        'sweep, 256 bands': sweep[np.arange(n) // band * band],
+    }
+
+
+def per_segment(layer, segments, colors, thickness):
+    starts, ends, drawn = segments
+    for start, end, is_drawn, color in zip(starts.tolist(), ends.tolist(), drawn.tolist(), colors.tolist()):
+        if is_drawn:
+            layer.add_segment(tuple(start), tuple(end), color, thickness)
+
+
+def batched(layer, segments, colors, thickness):
+    starts, ends, drawn = segments
+    layer.add_segments(starts, ends, colors, drawn, thickness)
+
+
+# Best of `repeats` runs, in segments per second
+def throughput(draw, size, segments, colors, thickness, repeats=3):
+    best = math.inf
+    for _ in range(repeats):
+        layer = CurveLayer(*size, background=(0, 0, 0))
+        started = time.perf_counter()
+        draw(layer, segments, colors, thickness)
+        best = min(best, time.perf_counter() - started)
+    return len(colors) / best, layer.canvas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m curvas.bench', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--segments', type=int, default=20000, help='Points per curve (default: 20000)')
+    parser.add_argument('--resolution', type=resolution, default=(1920, 1080), help='WIDTHxHEIGHT (default: 1920x1080)')
+    parser.add_argument('--thickness', type=int, default=2, help='Line thickness (default: 2)')
+    args = parser.parse_args(argv)
+
+    width, height = args.resolution
+    center = (width // 2, height // 2)
+    for name, params, scale, t_step in CASES:
+        curve = get_curve(name)
+        path = curve.sample(np.arange(args.segments), params, center, scale, t_step)
+        segments = path_segments(*path, width, height, args.thickness)
+        print(f'{curve.title}, {args.segments} segments at {width}x{height}, thickness {args.thickness}')
+        for label, colors in color_tables(args.segments).items():
+            slow, expected = throughput(per_segment, (width, height), segments, colors, args.thickness)
+            fast, canvas = throughput(batched, (width, height), segments, colors, args.thickness)
+            same = 'identical' if np.array_equal(expected, canvas) else 'DIFFERENT'
+            print(f'  {label:18} cv2.line {slow:12,.0f} seg/s   polylines {fast:12,.0f} seg/s'
+                  f'   {fast / slow:6.1f}x  ({same})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import numpy as np
+
+
+class GrowableArray:
+    """
+    NumPy array that grows at the end, for data that is appended to frame
+    after frame. Storage doubles when full, so appending n items costs
+    O(n) in total instead of copying everything on every append, and
+    `values` is a view of the filled part, not a copy. Items can be
+    scalars or fixed-shape rows, e.g. shape=(2,) for points.
+    """
+
+    def __init__(self, dtype, shape=(), capacity=1024):
+        self.data = np.empty((capacity,) + tuple(shape), dtype=dtype)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def values(self):
+        return self.data[:self.size]
+
+    def extend(self, items):
+        end = self.size + len(items)
+        if end > len(self.data):
+            grown = np.empty((max(end, 2 * len(self.data)),) + self.data.shape[1:], dtype=self.data.dtype)
+            grown[:self.size] = self.values
+            self.data = grown
+        self.data[self.size:end] = items
+        self.size = end
+
+    def append(self, item):
+        self.extend([item])
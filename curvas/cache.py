@@ -0,0 +1,124 @@
+import collections
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Sampled curves are cached in memory and on disk, set from the environment:
+#   CURVAS_CACHE=0          no cache
+#   CURVAS_CACHE=<dir>      cache directory (default: ~/.cache/curvas)
+#   CURVAS_CACHE_SIZE=<MB>  disk space the cache may use (default: 1024)
+
+# Bytes of samples kept in memory per process
+MEMORY_BYTES = 256 * 2 ** 20
+
+# Default disk budget, in MB
+DISK_MB = 1024
+
+
+def _default_directory():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'curvas')
+
+
+class SampleCache:
+    """
+    Curve coordinates (x, y) as float32 arrays, keyed by curve name,
+    parameters and the exact t values sampled. Recently used entries stay
+    in memory; every entry is also written to `directory` (if given) so
+    later runs skip evaluating the curve, at any resolution or style.
+    Both levels drop their least recently used entries beyond their size.
+    """
+
+    def __init__(self, directory=None, memory_bytes=MEMORY_BYTES, disk_bytes=DISK_MB * 2 ** 20):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.entries = collections.OrderedDict()
+        self.size = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(name, params, t):
+        digest = hashlib.sha1(json.dumps([name, params], sort_keys=True).encode())
+        digest.update(np.ascontiguousarray(t, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.npy')
+
+    def get(self, key):
+        samples = self.entries.get(key)
+        if samples is not None:
+            self.entries.move_to_end(key)
+            return samples
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            samples = np.load(path)
+            os.utime(path)   # Most recently used
+        except (OSError, ValueError):
+            return None
+        self._remember(key, samples)
+        return samples
+
+    def put(self, key, samples):
+        self._remember(key, samples)
+        if self.directory is not None:
+            # Written under a temporary name so other processes never read half a file
+            temporary = f'{self._path(key)}.{os.getpid()}.tmp'
+            with open(temporary, 'wb') as f:
+                np.save(f, samples)
+            os.replace(temporary, self._path(key))
+            self._evict_disk()
+
+    def _remember(self, key, samples):
+        if key not in self.entries:
+            self.entries[key] = samples
+            self.size += samples.nbytes
+        while self.size > self.memory_bytes and len(self.entries) > 1:
+            key, samples = self.entries.popitem(last=False)
+            self.size -= samples.nbytes
+
+    def _evict_disk(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npy'):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for mtime, size, path in files)
+        for mtime, size, path in sorted(files):
+            if total <= self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    # x, y of the curve at t: cached, or computed by evaluate() and stored
+    def sample(self, name, params, t, evaluate):
+        key = self.key(name, params, t)
+        samples = self.get(key)
+        if samples is None:
+            samples = np.array(evaluate(t), dtype=np.float32)
+            self.put(key, samples)
+        return samples[0], samples[1]
+
+
+_cache = None
+
+
+# The process-wide cache configured by the environment, or None when disabled
+def default_cache():
+    global _cache
+    setting = os.environ.get('CURVAS_CACHE', '')
+    if setting == '0':
+        return None
+    if _cache is None:
+        size = float(os.environ.get('CURVAS_CACHE_SIZE', DISK_MB))
+        _cache = SampleCache(setting or _default_directory(), disk_bytes=int(size * 2 ** 20))
+    return _cache
@@ -0,0 +1,103 @@
+import glob
+import json
+import os
+
+
+# 'video.mp4' -> 'video.checkpoint.json'
+def checkpoint_file(output_file):
+    root, ext = os.path.splitext(output_file)
+    return f'{root}.checkpoint.json'
+
+
+# (path, seed) of the existing files named `pattern` with its '{seed}' filled in
+def seeded_files(pattern):
+    before, after = pattern.split('{seed}', 1)
+    found = []
+    for path in glob.glob(glob.escape(before) + '*' + glob.escape(after)):
+        seed = path[len(before):len(path) - len(after)]
+        if seed.isdigit():
+            found.append((path, int(seed)))
+    return found
+
+
+# Videos of the renders of output_file that ran to the end: the video
+# exists and no checkpoint is left. A '{seed}' in the name matches any seed.
+def finished(output_file):
+    if '{seed}' in output_file:
+        videos = [path for path, seed in seeded_files(output_file)]
+    else:
+        videos = [output_file] if os.path.exists(output_file) else []
+    return [path for path in videos if not os.path.exists(checkpoint_file(path))]
+
+
+# Seed of an interrupted render whose output name is `pattern` with its
+# '{seed}' filled in, found from the checkpoint left next to it, or None.
+# The most recent checkpoint wins if there are several.
+def interrupted_seed(pattern):
+    found = [(os.path.getmtime(path), seed) for path, seed in seeded_files(checkpoint_file(pattern))]
+    return max(found)[1] if found else None
+
+
+class Checkpoint:
+    """
+    Progress of a resumable render, kept as JSON next to the output file.
+    It stores the render settings, the parameter sets drawn for every
+    simulation and their seeds, the units of work (simulation, start frame, stop frame)
+    and which of them already have a closed part file. Resuming renders
+    the stored units, whatever the number of workers now. The persistent
+    curve layer is not saved: it is rebuilt from the parameters, which
+    fully determine the sampled path.
+    """
+
+    def __init__(self, path, state):
+        self.path = path
+        self.state = state
+
+    @classmethod
+    def load_or_create(cls, output_file, settings, param_sets, units, seeds=None):
+        path = checkpoint_file(output_file)
+        # Round-trip through JSON so tuples compare equal to stored lists
+        settings = json.loads(json.dumps(settings))
+        if os.path.exists(path):
+            with open(path) as f:
+                state = json.load(f)
+            if state['settings'] != settings:
+                raise ValueError(f'{path} was written for different render settings; delete it to start over')
+            print(f"Resuming {output_file}: {len(state['done'])} of {len(state['units'])} parts already rendered")
+            return cls(path, state)
+        state = dict(settings=settings, param_sets=param_sets, seeds=seeds, units=[list(unit) for unit in units],
+                     done=[])
+        checkpoint = cls(path, state)
+        checkpoint.save()
+        return checkpoint
+
+    @property
+    def param_sets(self):
+        return self.state['param_sets']
+
+    # Units of work as (simulation, (start, stop))
+    @property
+    def units(self):
+        return [(sim, (start, stop)) for sim, start, stop in self.state['units']]
+
+    @property
+    def seeds(self):
+        return self.state.get('seeds')
+
+    def is_done(self, index):
+        return index in self.state['done']
+
+    def mark_done(self, index):
+        self.state['done'].append(index)
+        self.save()
+
+    # Write to a temporary file first so a crash never leaves half a checkpoint
+    def save(self):
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(self.state, f)
+        os.replace(temporary, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,82 @@
+import argparse
+import os
+
+from curvas.registry import CURVES
+from curvas.render import render
+from curvas.styles import STYLES, get_style, pick_strategy
+
+
+# "1920x1080" -> (1920, 1080)
+def resolution(value):
+    try:
+        width, height = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Resolution must look like 1920x1080, got '{value}'")
+    return width, height
+
+
+# Encoder options given on the command line, as render(encoder=...)
+def encoder_settings(args):
+    options = dict(codec=args.codec, preset=args.preset, crf=args.crf, threads=args.encoder_threads)
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m curvas', description='Render animated mathematical curves to video.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help='List the available curves and styles')
+
+    render_parser = commands.add_parser('render', help='Render a curve to a video file')
+    render_parser.add_argument('curve', choices=sorted(CURVES))
+    render_parser.add_argument('--fps', type=int, default=60, help='Frames per second (default: 60)')
+    render_parser.add_argument('--duration', type=float, default=10, help='Duration in seconds (default: 10)')
+    render_parser.add_argument('--resolution', type=resolution, default=(1920, 1080), help='WIDTHxHEIGHT (default: 1920x1080)')
+    render_parser.add_argument('--style', choices=sorted(STYLES), default='plain', help='Look of the animation (default: plain)')
+    render_parser.add_argument('--output', help="Output file, '{seed}' is replaced by the seed (default: <curve>_curve_<seed>.mp4)")
+    render_parser.add_argument('--scale', type=float, help='Pixels per curve unit (default: per curve)')
+    render_parser.add_argument('--fit', action='store_true', help='Pick scale and center so the whole curve fits')
+    render_parser.add_argument('--scale-growth', type=float, default=0.0, help='Scale increase per frame')
+    render_parser.add_argument('--thickness', type=int, help='Line thickness (default: per style)')
+    render_parser.add_argument('--adaptive', action='store_true',
+                               help='Add points where the curve moves fast or bends sharply')
+    render_parser.add_argument('--simulations', type=int, default=1, help='Random parameter sets rendered into the same file')
+    render_parser.add_argument('--seed', type=int,
+                               help='Seed of the random parameters (default: a fresh one, printed and in the file name)')
+    render_parser.add_argument('--workers', type=int, help='Processes for parallel simulations (default: all cores)')
+    render_parser.add_argument('--chunks', type=int, help='Split one long animation into this many parallel chunks')
+    render_parser.add_argument('--headless', action='store_true', help='Never open a preview window')
+    render_parser.add_argument('--resumable', action='store_true',
+                               help='Write closed segments and a checkpoint; run again to resume after an interruption')
+    render_parser.add_argument('--codec', choices=['libx264', 'libx265', 'ffv1', 'mp4v'],
+                               help='Video codec (default: libx264 through ffmpeg, mp4v through OpenCV without it)')
+    render_parser.add_argument('--preset', help='ffmpeg encoder preset, e.g. veryfast or slow')
+    render_parser.add_argument('--crf', type=float, help='Constant rate factor (lower is better quality)')
+    render_parser.add_argument('--encoder-threads', type=int, help='Threads per ffmpeg encoder')
+    render_parser.add_argument('--profile', action='store_const', const='1',
+                               help='Report progress and per-stage timings')
+    render_parser.add_argument('--trace', dest='profile', action='store_const', const='json',
+                               help='Like --profile, and write a per-frame <output>.profile.json trace')
+    render_parser.add_argument('--memory', dest='profile', action='store_const', const='memory',
+                               help='Like --profile, and report the memory allocated per frame')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'list':
+        for name, curve in sorted(CURVES.items()):
+            print(f'{name:14} {curve.title}')
+        print()
+        for name in sorted(STYLES):
+            print(f'{name:14} {pick_strategy(get_style(name))} strategy')
+        return
+    if args.profile:
+        # Through the environment so pool workers see it too
+        os.environ['CURVAS_PROFILE'] = args.profile
+    render(args.curve, fps=args.fps, duration=args.duration, resolution=args.resolution,
+           style=args.style, output_file=args.output, scale=args.scale, fit=args.fit,
+           scale_growth=args.scale_growth, thickness=args.thickness, adaptive=args.adaptive or None,
+           simulations=args.simulations, workers=args.workers,
+           chunks=args.chunks, headless=args.headless or None,
+           resumable=args.resumable, encoder=encoder_settings(args), seed=args.seed)
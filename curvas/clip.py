@@ -0,0 +1,46 @@
+import numpy as np
+
+
+def clip_segments(starts, ends, left, top, right, bottom):
+    """
+    Liang-Barsky clipping of the segments starts[i] -> ends[i], given as
+    (n, 2) arrays, against the box left <= x <= right, top <= y <= bottom,
+    all segments at once. Returns the clipped starts and ends (float) and
+    whether each segment reaches into the box at all.
+    """
+    starts = np.asarray(starts, dtype=float)
+    deltas = np.asarray(ends, dtype=float) - starts
+    x, y = starts[:, 0], starts[:, 1]
+    dx, dy = deltas[:, 0], deltas[:, 1]
+    enter = np.zeros(len(starts))
+    leave = np.ones(len(starts))
+    inside = np.ones(len(starts), dtype=bool)
+    # For each edge, p < 0 where the segment enters across it and p > 0
+    # where it leaves; q / p is where along the segment it crosses
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, q in ((-dx, x - left), (dx, right - x), (-dy, y - top), (dy, bottom - y)):
+            inside &= (p != 0) | (q >= 0)
+            crossing = q / p
+            enter = np.where(p < 0, np.maximum(enter, crossing), enter)
+            leave = np.where(p > 0, np.minimum(leave, crossing), leave)
+    inside &= enter <= leave
+    return starts + enter[:, None] * deltas, starts + leave[:, None] * deltas, inside
+
+
+def path_segments(x_pixels, y_pixels, valid, width, height, margin=0):
+    """
+    Segments between consecutive points of a path, clipped to the frame
+    grown by `margin` pixels on every side (so thick lines still reach the
+    edge). Segment i ends at point i; segment 0, segments touching an
+    undefined point and segments entirely outside are not drawn. Returns
+    int32 (n, 2) starts and ends and the mask of drawn segments.
+    Segments inside the frame keep their end points exactly.
+    """
+    points = np.column_stack([x_pixels, y_pixels])
+    previous = np.concatenate([points[:1], points[:-1]])
+    starts, ends, drawn = clip_segments(previous, points, -margin, -margin,
+                                        width - 1 + margin, height - 1 + margin)
+    drawn &= valid
+    drawn[1:] &= valid[:-1]
+    drawn[:1] = False
+    return np.rint(starts).astype(np.int32), np.rint(ends).astype(np.int32), drawn
@@ -0,0 +1,27 @@
+import numpy as np
+
+
+# Rainbow BGR color for a phase angle in radians (array in, array out).
+# Same formula as the get_color() helpers of the colorful scripts.
+def rainbow(phase):
+    phase = np.asarray(phase, dtype=float)
+    r = 128 + 127 * np.sin(phase)
+    g = 128 + 127 * np.sin(phase + 2)
+    b = 128 + 127 * np.sin(phase + 4)
+    return np.stack([b, g, r], axis=-1).astype(np.int64)
+
+
+# Palettes: phase of step i out of n
+PALETTES = {
+    'sweep': lambda i, n: 2 * np.pi * i / max(n, 1),          # One cycle over the whole run
+    'rapid': lambda i, n: 2 * np.pi * 200 * i / max(n, 1),    # 200 cycles over the whole run
+    'cycle': lambda i, n: 0.1 * i,                            # Independent of the run length
+}
+
+
+# Colors for steps 0..n-1 as an (n, 3) uint8 lookup table, or for the
+# given steps only (an array of step numbers out of n)
+def palette_table(palette, n, total=None, steps=None):
+    if steps is None:
+        steps = np.arange(n)
+    return rainbow(PALETTES[palette](steps, n if total is None else total)).astype(np.uint8)
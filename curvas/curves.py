@@ -0,0 +1,152 @@
+import numpy as np
+
+# Vectorized curve functions.
+# Every function takes a NumPy array of t values (scalars also work) and
+# returns coordinate arrays of the same shape, so a whole animation's path
+# can be sampled in one call before the frame loop starts.
+
+
+# Spiral of Archimedes
+def spiral_archimedes(t, a, b):
+    r = a + b * t
+    return r * np.cos(t), r * np.sin(t)
+
+
+# Astroid
+def astroid_curve(t, a):
+    return a * np.cos(t) ** 3, a * np.sin(t) ** 3
+
+
+# Butterfly curve
+def butterfly_curve(t):
+    radius = np.exp(np.cos(t)) - 2 * np.cos(4 * t) - np.sin(t / 12) ** 5
+    return np.sin(t) * radius, np.cos(t) * radius
+
+
+# Cardioid
+def cardioid_curve(t, a):
+    r = a * (1 - np.cos(t))
+    return r * np.cos(t), r * np.sin(t)
+
+
+# Cissoid of Diocles (undefined at t = 0, returned as NaN)
+def cissoid_diocles(t, a):
+    t = np.asarray(t, dtype=float)
+    tan_sq = np.tan(t) ** 2
+    x = a * tan_sq / (1 + tan_sq)
+    y = np.tan(t) * x
+    x = np.where(t == 0, np.nan, x)
+    y = np.where(t == 0, np.nan, y)
+    return x, y
+
+
+# Cloverleaf curve
+def cloverleaf_curve(t, n):
+    return np.sin(t) * np.cos(n * t), np.cos(t) * np.sin(n * t)
+
+
+# Deltoid
+def deltoid_curve(t, R):
+    x = 2 * R * np.cos(t) + R * np.cos(2 * t)
+    y = 2 * R * np.sin(t) - R * np.sin(2 * t)
+    return x, y
+
+
+# Epicycloid
+def epicycloid_curve(t, R, r):
+    k = (R + r) / r
+    x = (R + r) * np.cos(t) - r * np.cos(k * t)
+    y = (R + r) * np.sin(t) - r * np.sin(k * t)
+    return x, y
+
+
+# Damped two-pendulum harmonograph
+def harmonograph_curve(t, A1, A2, f1, f2, d1, d2, p1, p2):
+    x = A1 * np.sin(f1 * t + p1) * np.exp(-d1 * t)
+    y = A2 * np.sin(f2 * t + p2) * np.exp(-d2 * t)
+    return x, y
+
+
+# Heart curve (y already flipped for screen orientation)
+def heart_curve(t):
+    x = 16 * np.sin(t) ** 3
+    y = 13 * np.cos(t) - 5 * np.cos(2 * t) - 2 * np.cos(3 * t) - np.cos(4 * t)
+    return x, -y
+
+
+# Hypotrochoid
+def hypotrochoid_curve(t, R, r, d):
+    k = (R - r) / r
+    x = (R - r) * np.cos(t) + d * np.cos(k * t)
+    y = (R - r) * np.sin(t) - d * np.sin(k * t)
+    return x, y
+
+
+# Lemniscate of Bernoulli (NaN where cos(2t) < 0)
+def lemniscate_curve(t, a):
+    cos_2t = np.cos(2 * np.asarray(t, dtype=float))
+    r = a * np.sqrt(np.where(cos_2t < 0, np.nan, cos_2t))
+    return r * np.cos(t), r * np.sin(t)
+
+
+# Lissajous curve
+def lissajous_curve(t, A, B, a, b, delta):
+    return A * np.sin(a * t + delta), B * np.sin(b * t)
+
+
+# Logarithmic spiral
+def logarithmic_spiral(t, a, b):
+    r = a * np.exp(b * t)
+    return r * np.cos(t), r * np.sin(t)
+
+
+# Nephroid
+def nephroid_curve(t, a):
+    x = a * (3 * np.cos(t) - np.cos(3 * t))
+    y = a * (3 * np.sin(t) - np.sin(3 * t))
+    return x, y
+
+
+# Rose curve
+def rose_curve(t, a, k):
+    r = a * np.cos(k * t)
+    return r * np.cos(t), r * np.sin(t)
+
+
+# Superellipse (Lamé curve)
+def superellipse_curve(t, a, b, n):
+    cos_t, sin_t = np.cos(t), np.sin(t)
+    x = a * np.sign(cos_t) * np.abs(cos_t) ** (2 / n)
+    y = b * np.sign(sin_t) * np.abs(sin_t) ** (2 / n)
+    return x, y
+
+
+# Viviani's curve in 3D
+def viviani_curve(t, a):
+    x = a * (1 + np.cos(t))
+    y = a * np.sin(t)
+    z = 2 * a * np.sin(t / 2)
+    return x, y, z
+
+
+# Project 3D coordinates to 2D
+def project_to_2d(x, y, z):
+    return x + z * 0.5, y - z * 0.5
+
+
+# Largest pixel coordinate kept; only on-screen points are ever drawn
+PIXEL_LIMIT = 2 ** 30
+
+
+# Map curve coordinates to integer pixel positions around the center.
+# Points that are NaN (undefined) come back masked out in `valid`.
+def to_pixels(x, y, center, scale=1, flip_y=True):
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = np.isfinite(x) & np.isfinite(y)
+    x_pixels = center[0] + np.where(valid, x, 0) * scale
+    y_offset = np.where(valid, y, 0) * scale
+    y_pixels = center[1] - y_offset if flip_y else center[1] + y_offset
+    # int32 like OpenCV's points; far off-screen values are clamped, not wrapped
+    return (np.clip(x_pixels, -PIXEL_LIMIT, PIXEL_LIMIT).astype(np.int32),
+            np.clip(y_pixels, -PIXEL_LIMIT, PIXEL_LIMIT).astype(np.int32), valid)
@@ -0,0 +1,76 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+
+def _call(function, job):
+    return function(**job)
+
+
+# Call function(**job) for every job on a process pool.
+# Results come back in job order; the first failing job raises.
+# on_done(index, result) is called in this process as each job finishes.
+def run_jobs(function, jobs, workers=None, on_done=None):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+    results = [None] * len(jobs)
+    if workers == 1:
+        for index, job in enumerate(jobs):
+            results[index] = function(**job)
+            if on_done is not None:
+                on_done(index, results[index])
+        return results
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_call, function, job): index for index, job in enumerate(jobs)}
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            if on_done is not None:
+                on_done(index, results[index])
+    return results
+
+
+# 'video.mp4' -> 'video.part003.mp4'
+def part_file(output_file, index):
+    root, ext = os.path.splitext(output_file)
+    return f'{root}.part{index:03d}{ext}'
+
+
+# Join rendered parts, in order, into one video and delete the parts.
+# ffmpeg copies the streams without re-encoding and sets the metadata tags;
+# without it the frames are decoded and written again with OpenCV.
+def concatenate_videos(parts, output_file, metadata=None):
+    if len(parts) == 1:
+        os.replace(parts[0], output_file)
+        return
+    if shutil.which('ffmpeg'):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as listing:
+            for part in parts:
+                listing.write(f"file '{os.path.abspath(part)}'\n")
+        tags = [option for key, value in (metadata or {}).items() for option in ('-metadata', f'{key}={value}')]
+        try:
+            subprocess.run(['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0',
+                            '-i', listing.name, '-c', 'copy'] + tags + [output_file], check=True)
+        finally:
+            os.remove(listing.name)
+    else:
+        first = cv2.VideoCapture(parts[0])
+        fps = first.get(cv2.CAP_PROP_FPS)
+        size = (int(first.get(cv2.CAP_PROP_FRAME_WIDTH)), int(first.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        first.release()
+        video_writer = cv2.VideoWriter(output_file, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+        for part in parts:
+            capture = cv2.VideoCapture(part)
+            ok, frame = capture.read()
+            while ok:
+                video_writer.write(frame)
+                ok, frame = capture.read()
+            capture.release()
+        video_writer.release()
+    for part in parts:
+        os.remove(part)
@@ -0,0 +1,172 @@
+import cv2
+import numpy as np
+
+from curvas.buffer import GrowableArray
+
+# Axis color used by the white-background scripts
+AXIS_COLOR = (200, 200, 200)
+
+
+class CurveLayer:
+    """
+    Persistent canvas for a curve that grows by one segment per frame.
+    Only the newest segment is rasterized, so a whole render costs one
+    cv2.line call per frame instead of one per segment drawn so far.
+    Segments come already clipped to the frame (see clip.path_segments).
+    The box around everything drawn since the last take_dirty() is kept
+    so only that part of the canvas needs compositing again.
+    """
+
+    # background is a BGR color or an image to draw on top of (copied)
+    def __init__(self, width, height, background=(255, 255, 255)):
+        if isinstance(background, np.ndarray):
+            self.canvas = background.copy()
+        else:
+            self.canvas = np.full((height, width, 3), background, dtype=np.uint8)
+        self.background = background
+        self.dirty = None
+
+    # Start over on the same canvas, without allocating a new one
+    def clear(self):
+        self.canvas[:] = self.background
+        height, width = self.canvas.shape[:2]
+        self.dirty = (0, 0, width, height)
+
+    # (left, top, right, bottom) box changed since the previous call, or
+    # None if nothing was drawn
+    def take_dirty(self):
+        dirty, self.dirty = self.dirty, None
+        return dirty
+
+    # Grow the dirty box over lines of `thickness` between these x and y
+    # extremes, clipped to the canvas
+    def _mark(self, left, top, right, bottom, thickness):
+        height, width = self.canvas.shape[:2]
+        margin = thickness + 1
+        box = (max(left - margin, 0), max(top - margin, 0),
+               min(right + margin + 1, width), min(bottom + margin + 1, height))
+        if box[0] >= box[2] or box[1] >= box[3]:
+            return
+        if self.dirty is not None:
+            box = (min(box[0], self.dirty[0]), min(box[1], self.dirty[1]),
+                   max(box[2], self.dirty[2]), max(box[3], self.dirty[3]))
+        self.dirty = box
+
+    def add_segment(self, start, end, color, thickness=1):
+        cv2.line(self.canvas, start, end, color, thickness)
+        self._mark(min(start[0], end[0]), min(start[1], end[1]), max(start[0], end[0]), max(start[1], end[1]),
+                   thickness)
+
+    def add_segments(self, starts, ends, colors, drawn, thickness=1):
+        """
+        Same drawing as add_segment() for every segment i with drawn[i],
+        in order, from starts[i] to ends[i] in colors[i] ((n, 2) int32 and
+        (n, 3) arrays). Segments that continue one another form a stroke,
+        and consecutive strokes of one color go to a single cv2.polylines
+        call, so a single-color path costs one call.
+        """
+        kept = np.flatnonzero(drawn)
+        if len(kept) == 0:
+            return
+        starts, ends, segment_colors = starts[kept], ends[kept], colors[kept]
+        # A new stroke begins after a gap or a clipped end; a new call after a color change
+        new_stroke = np.ones(len(kept), dtype=bool)
+        new_stroke[1:] = (np.diff(kept) != 1) | (starts[1:] != ends[:-1]).any(axis=1)
+        new_color = np.ones(len(kept), dtype=bool)
+        new_color[1:] = (segment_colors[1:] != segment_colors[:-1]).any(axis=1)
+        stroke_bounds = np.flatnonzero(new_stroke | new_color).tolist() + [len(kept)]
+        call_bounds = set(np.flatnonzero(new_color).tolist())
+        strokes = []
+        for first, last in zip(stroke_bounds[:-1], stroke_bounds[1:]):
+            if first in call_bounds and strokes:
+                cv2.polylines(self.canvas, strokes, False, color, thickness)
+                strokes = []
+            strokes.append(np.concatenate([starts[first:first + 1], ends[first:last]]))
+            color = segment_colors[first].tolist()
+        cv2.polylines(self.canvas, strokes, False, color, thickness)
+        corners = np.concatenate([starts, ends])
+        left, top = corners.min(axis=0).tolist()
+        right, bottom = corners.max(axis=0).tolist()
+        self._mark(left, top, right, bottom, thickness)
+
+
+class IndexLayer:
+    """
+    Segment-index buffer for a curve whose colors all change every frame.
+    Each segment is rasterized once, writing its number (1, 2, ...) rather
+    than a color; later segments overwrite earlier ones just like redrawing
+    them in order would. paint() then colors the whole curve with a single
+    palette lookup instead of one cv2.line call per segment. Only the
+    numbers still on screen get a color each frame, so painting costs
+    what the frame shows, not the length of the curve.
+    """
+
+    # segments: upper bound on the number of segments, to pick the index type
+    def __init__(self, width, height, segments, background=(255, 255, 255)):
+        # cv2 cannot draw into uint32 images, int32 is the next size up
+        dtype = np.uint16 if segments < 2 ** 16 else np.int32
+        self.index = np.zeros((height, width), dtype=dtype)
+        if isinstance(background, np.ndarray):
+            self.canvas = background.copy()
+        else:
+            self.canvas = np.full((height, width, 3), background, dtype=np.uint8)
+        self.segments = 0
+        # Flat positions of the drawn pixels, gathered segment by segment
+        self.drawn = GrowableArray(np.intp)
+        # Numbers that may still be on screen: every segment that drew a
+        # pixel, pruned of the overwritten ones whenever the list doubles
+        self.visible = GrowableArray(np.int64)
+        self.pruned = 0
+        # Color of every number, filled in for the visible ones by paint()
+        self.table = np.zeros((segments + 1, 3), dtype=np.uint8)
+
+    # Rasterize a segment with the next segment number, or with `number`
+    # (which must keep increasing) if given
+    def add_segment(self, start, end, thickness=1, number=None):
+        self.segments = self.segments + 1 if number is None else number
+        height, width = self.index.shape
+        margin = thickness + 1
+        left = max(min(start[0], end[0]) - margin, 0)
+        right = min(max(start[0], end[0]) + margin + 1, width)
+        top = max(min(start[1], end[1]) - margin, 0)
+        bottom = min(max(start[1], end[1]) + margin + 1, height)
+        box = self.index[top:bottom, left:right]
+        empty = box == 0
+        cv2.line(self.index, start, end, self.segments, thickness)
+        mine = box == self.segments
+        rows, cols = np.nonzero(empty & mine)
+        self.drawn.extend((rows + top) * width + cols + left)
+        if mine.any():
+            self.visible.append(self.segments)
+
+    # Segment numbers that may be on screen, sorted
+    def _visible_numbers(self):
+        if len(self.visible) > 2 * max(self.pruned, 4096):
+            shown = np.zeros(len(self.table), dtype=bool)
+            shown[self.index.ravel()[self.drawn.values]] = True
+            numbers = self.visible.values[shown[self.visible.values]]
+            self.visible = GrowableArray(np.int64, capacity=2 * len(numbers) + 1)
+            self.visible.extend(numbers)
+            self.pruned = len(numbers)
+        return self.visible.values
+
+    # Color every drawn pixel by its segment number; colors(numbers) returns
+    # the (len(numbers), 3) uint8 colors of those numbers. Drawn pixels stay
+    # drawn, so the canvas is repainted in place frame after frame.
+    def paint(self, colors):
+        numbers = self._visible_numbers()
+        self.table[numbers] = colors(numbers)
+        drawn = self.drawn.values
+        # View BGR triplets as single 3-byte items so one gather moves a pixel
+        pixels = self.canvas.reshape(-1, 3).view('V3').ravel()
+        table = self.table.view('V3').ravel()
+        pixels[drawn] = table[self.index.ravel()[drawn]]
+        return self.canvas
+
+
+# Draw reference axes through the center
+def draw_axes(frame, center, color=AXIS_COLOR):
+    height, width = frame.shape[:2]
+    cv2.line(frame, (0, center[1]), (width, center[1]), color, 1)
+    cv2.line(frame, (center[0], 0), (center[0], height), color, 1)
+    return frame
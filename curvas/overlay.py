@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+
+from curvas.layer import draw_axes
+
+# Overlays already built, keyed by resolution, center and contents
+_overlays = {}
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+class Overlay:
+    """
+    Static pixels drawn over every frame: axes, grid, tick marks, text.
+    They are rasterized once; only the positions and colors of the drawn
+    pixels are kept, so applying an overlay is one indexed copy whose cost
+    depends on how many pixels it covers, not on how many lines or letters
+    it is made of.
+    """
+
+    def __init__(self, image, mask):
+        self.positions = np.flatnonzero(mask)
+        colors = np.ascontiguousarray(image.reshape(-1, 3)[self.positions])
+        # BGR triplets as single 3-byte items, like IndexLayer.paint()
+        self.colors = colors.view('V3').ravel()
+
+    def apply(self, frame):
+        np.put(frame.reshape(-1, 3).view('V3').ravel(), self.positions, self.colors)
+        return frame
+
+
+# Lines every `spacing` pixels, through the center and outwards
+def _grid_positions(center, size, spacing):
+    first = center % spacing
+    return range(first, size, spacing)
+
+
+# Draw the same shape on the overlay image, in its color, and on the mask
+def _draw(image, mask, color, draw):
+    draw(image, color)
+    draw(mask, 255)
+
+
+def build_overlay(width, height, center, axes=None, grid=None, ticks=None, labels=None, text=(), watermark=None):
+    """
+    Rasterize an overlay. axes is a color; grid is (spacing, color); ticks
+    is (spacing, length), drawn in the axes color; text lines go in the top
+    left corner in the labels color and the watermark, (text, color), in
+    the bottom right. Elements are drawn in that order, later ones on top.
+    """
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    mask = np.zeros((height, width), dtype=np.uint8)
+
+    if grid is not None:
+        spacing, grid_color = grid
+        for x in _grid_positions(center[0], width, spacing):
+            _draw(image, mask, grid_color, lambda img, color: cv2.line(img, (x, 0), (x, height), color, 1))
+        for y in _grid_positions(center[1], height, spacing):
+            _draw(image, mask, grid_color, lambda img, color: cv2.line(img, (0, y), (width, y), color, 1))
+
+    if axes is not None:
+        _draw(image, mask, axes, lambda img, color: draw_axes(img, center, color))
+        if ticks is not None:
+            spacing, length = ticks
+            for x in _grid_positions(center[0], width, spacing):
+                _draw(image, mask, axes, lambda img, color: cv2.line(
+                    img, (x, center[1] - length), (x, center[1] + length), color, 1))
+            for y in _grid_positions(center[1], height, spacing):
+                _draw(image, mask, axes, lambda img, color: cv2.line(
+                    img, (center[0] - length, y), (center[0] + length, y), color, 1))
+
+    if labels is not None:
+        for n, line in enumerate(text):
+            _draw(image, mask, labels, lambda img, color: cv2.putText(
+                img, line, (20, 40 + 30 * n), FONT, 0.8, color, 1))
+
+    if watermark is not None:
+        mark, mark_color = watermark
+        (text_width, text_height), baseline = cv2.getTextSize(mark, FONT, 0.6, 1)
+        origin = (width - text_width - 20, height - baseline - 20)
+        _draw(image, mask, mark_color, lambda img, color: cv2.putText(img, mark, origin, FONT, 0.6, color, 1))
+
+    return Overlay(image, mask)
+
+
+# Overlay of a style at one resolution, built on first use.
+# `text` holds per-simulation lines such as the curve parameters.
+def style_overlay(style, width, height, center, text=()):
+    if all(style[key] is None for key in ('axes', 'grid', 'labels', 'watermark')):
+        return None
+    text = tuple(text) if style['labels'] is not None else ()
+    key = (width, height, center, style['axes'], style['grid'], style['ticks'], style['labels'], text,
+           style['watermark'])
+    overlay = _overlays.get(key)
+    if overlay is None:
+        overlay = build_overlay(width, height, center, style['axes'], style['grid'], style['ticks'],
+                                style['labels'], text, style['watermark'])
+        _overlays[key] = overlay
+    return overlay
+
+
+# 'R = 120.5, r = 35.25' style lines for the parameters of a simulation
+def parameter_text(params):
+    return [', '.join(f'{name} = {value:.4g}' for name, value in params.items())] if params else []
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import cv2
+
+# Preview settings, read from the environment so every script honours them:
+#   CURVAS_HEADLESS=1        never open a window (batch renders on servers)
+#   CURVAS_PREVIEW_EVERY=N   only show every Nth frame
+#   CURVAS_PREVIEW_SCALE=S   shrink the preview by S (e.g. 0.25)
+
+
+# Linux boxes without an X11/Wayland display cannot open windows
+def _display_available():
+    if not sys.platform.startswith('linux'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+class Preview:
+    """
+    Optional live preview of the rendered frames.
+    In headless mode no GUI call is ever made, so the frame loop runs at
+    encoder speed. Otherwise every Nth frame is shown, optionally scaled
+    down, and 'q' in the window asks the loop to stop.
+    """
+
+    def __init__(self, title, every=None, scale=None, headless=None):
+        if headless is None:
+            headless = os.environ.get('CURVAS_HEADLESS', '') not in ('', '0') or not _display_available()
+        if every is None:
+            every = int(os.environ.get('CURVAS_PREVIEW_EVERY', 1))
+        if scale is None:
+            scale = float(os.environ.get('CURVAS_PREVIEW_SCALE', 1.0))
+        self.title = title
+        self.every = max(1, every)
+        self.scale = scale
+        self.headless = headless
+        self.frame_count = 0
+        self.shown = False
+
+    def show(self, frame):
+        self.shown = False
+        self.frame_count += 1
+        if self.headless or (self.frame_count - 1) % self.every:
+            return
+        if self.scale != 1.0:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        try:
+            cv2.imshow(self.title, frame)
+        except cv2.error:
+            # OpenCV built without GUI support: carry on headless
+            print('No preview available, rendering headless')
+            self.headless = True
+            return
+        self.shown = True
+
+    # Poll the window for 'q' (only when a frame was actually shown)
+    def quit_requested(self):
+        if not self.shown:
+            return False
+        return cv2.waitKey(1) & 0xFF == ord('q')
+
+    def close(self):
+        if not self.headless:
+            cv2.destroyAllWindows()
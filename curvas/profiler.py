@@ -0,0 +1,175 @@
+import datetime
+import json
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+# Profiling, switched on from the environment so every script honours it:
+#   CURVAS_PROFILE=1      progress lines while rendering and a summary at the end
+#   CURVAS_PROFILE=json   the same, plus a per-frame trace next to the video
+#   CURVAS_PROFILE=memory the same, plus the memory allocated per frame
+#                         (traced with tracemalloc, which slows rendering down)
+
+# Stages of the frame loop, in the order they run
+STAGES = ('sample', 'draw', 'composite', 'preview', 'write')
+
+
+class Profiler:
+    """
+    Per-stage timings of a frame loop.
+    lap(stage) charges the time since the previous lap to `stage` and
+    frame_done() closes the frame, so every second of the loop lands in
+    exactly one stage. The encoder thread reports its own time with add().
+    With memory on, frame_done() also records how far traced memory rose
+    above its level at the start of the frame.
+    When disabled every call returns straight away.
+    """
+
+    def __init__(self, label, total_frames, enabled=None, trace=None, memory=None, report_every=5.0):
+        mode = os.environ.get('CURVAS_PROFILE', '')
+        if enabled is None:
+            enabled = mode not in ('', '0')
+        if trace is None:
+            trace = mode == 'json'
+        if memory is None:
+            memory = mode == 'memory'
+        self.label = label
+        self.total_frames = total_frames
+        self.enabled = enabled
+        self.trace = enabled and trace
+        self.memory = enabled and memory
+        self.allocations = []
+        if self.memory:
+            tracemalloc.start()
+            self.frame_memory = tracemalloc.get_traced_memory()[0]
+        self.report_every = report_every
+        self.totals = dict.fromkeys(STAGES + ('encode',), 0.0)
+        self.current = dict.fromkeys(STAGES, 0.0)
+        self.latencies = []
+        self.repeated = 0
+        self.rows = []
+        self.started = self.last = self.frame_start = time.perf_counter()
+        self.reported_at = self.started
+        self.reported_frames = 0
+
+    def lap(self, stage):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[stage] += now - self.last
+        self.last = now
+
+    # Time spent outside the frame loop thread (the video encoder)
+    def add(self, stage, seconds):
+        if self.enabled:
+            self.totals[stage] += seconds
+
+    # repeated: the frame was the previous one encoded again
+    def frame_done(self, repeated=False):
+        if not self.enabled:
+            return
+        self.repeated += repeated
+        now = time.perf_counter()
+        latency = now - self.frame_start
+        self.frame_start = now
+        self.latencies.append(latency)
+        if self.trace:
+            self.rows.append([latency] + [self.current[stage] for stage in STAGES])
+        for stage in STAGES:
+            self.totals[stage] += self.current[stage]
+            self.current[stage] = 0.0
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            self.allocations.append(peak - self.frame_memory)
+            tracemalloc.reset_peak()
+            self.frame_memory = current
+        if now - self.reported_at >= self.report_every:
+            self.report(now)
+
+    # Progress line: rolling fps since the last report and ETA for this job
+    def report(self, now):
+        frames = len(self.latencies)
+        fps = (frames - self.reported_frames) / (now - self.reported_at)
+        self.reported_at = now
+        self.reported_frames = frames
+        remaining = max(self.total_frames - frames, 0)
+        eta = datetime.timedelta(seconds=round(remaining / fps)) if fps > 0 else '?'
+        percent = frames / self.total_frames if self.total_frames else 1.0
+        print(f'{self.label}: frame {frames}/{self.total_frames} ({percent:.0%}), {fps:.1f} fps, ETA {eta}')
+
+    def summary(self):
+        if not self.enabled or not self.latencies:
+            return None
+        elapsed = time.perf_counter() - self.started
+        frames = len(self.latencies)
+        latencies = np.array(self.latencies) * 1000
+        result = dict(label=self.label, frames=frames, seconds=elapsed, fps=frames / elapsed,
+                      p50_ms=float(np.percentile(latencies, 50)), p99_ms=float(np.percentile(latencies, 99)),
+                      repeated=self.repeated, stages=dict(self.totals))
+        print(f"{self.label}: {frames} frames in {elapsed:.1f} s ({result['fps']:.1f} fps), "
+              f"frame latency p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+              f"{self.repeated} unchanged frames repeated")
+        for stage, seconds in self.totals.items():
+            # The encoder runs on its own thread, alongside the other stages
+            note = ' (background thread)' if stage == 'encode' else f' {seconds / elapsed:6.1%}'
+            print(f'  {stage:10} {seconds:8.2f} s {seconds / frames * 1000:8.3f} ms/frame{note}')
+        if self.memory:
+            tracemalloc.stop()
+            # The first frames fill the pools and caches; the rest is steady state
+            steady = np.array(self.allocations[len(self.allocations) // 10:]) / 1024
+            result['allocated_kib_p50'] = float(np.percentile(steady, 50))
+            result['allocated_kib_max'] = float(steady.max())
+            print(f"  memory     {result['allocated_kib_p50']:8.1f} KiB allocated per frame (p50), "
+                  f"{result['allocated_kib_max']:.1f} KiB max, after the first {len(self.allocations) // 10} frames")
+        if self.trace:
+            root, ext = os.path.splitext(self.label)
+            with open(f'{root}.profile.json', 'w') as f:
+                json.dump(dict(result, columns=['latency'] + list(STAGES), frames_trace=self.rows), f)
+        return result
+
+
+class JobProgress:
+    """
+    Progress of a render split into parts (chunks, segments or
+    simulations), each with its own Profiler. part_done(n) is called as
+    part n finishes and prints the frames done out of the whole job, with
+    an ETA from the frames per second of the job so far, parts running
+    side by side included. Parts already rendered before (when resuming)
+    are not counted. Switched on by CURVAS_PROFILE, like Profiler.
+    """
+
+    def __init__(self, label, part_frames, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get('CURVAS_PROFILE', '') not in ('', '0')
+        self.label = label
+        self.part_frames = part_frames
+        self.total_frames = sum(part_frames.values())
+        self.enabled = enabled
+        self.frames = 0
+        self.parts = 0
+        self.started = time.perf_counter()
+
+    def part_done(self, part):
+        if not self.enabled:
+            return
+        self.frames += self.part_frames[part]
+        self.parts += 1
+        elapsed = time.perf_counter() - self.started
+        fps = self.frames / elapsed
+        remaining = self.total_frames - self.frames
+        eta = datetime.timedelta(seconds=round(remaining / fps)) if fps > 0 else '?'
+        percent = self.frames / self.total_frames if self.total_frames else 1.0
+        print(f'{self.label}: part {self.parts}/{len(self.part_frames)}, frame {self.frames}/{self.total_frames} '
+              f'({percent:.0%}), {fps:.1f} fps, ETA {eta}')
+
+    def summary(self):
+        if not self.enabled or not self.parts:
+            return None
+        elapsed = time.perf_counter() - self.started
+        result = dict(label=self.label, parts=self.parts, frames=self.frames, seconds=elapsed,
+                      fps=self.frames / elapsed)
+        print(f"{self.label}: {self.frames} frames in {self.parts} parts, {elapsed:.1f} s "
+              f"({result['fps']:.1f} fps over the whole job)")
+        return result
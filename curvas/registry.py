@@ -0,0 +1,214 @@
+import math
+
+import numpy as np
+
+from curvas import curves
+
+# Longest period tried for closed curves, in turns of t (2 pi each)
+MAX_TURNS = 50
+
+# Samples compared along one period when checking that a curve closes
+PERIOD_SAMPLES = 1000
+
+# How close (in frames) laps must come to a whole number of frames for
+# the later laps to be sampled at the same points as the first ones
+FRAME_EPSILON = 1e-6
+
+# Empty border left around a fitted curve, as a fraction of the frame
+FIT_MARGIN = 0.05
+
+
+class Curve:
+    """
+    Everything the renderer needs to know about one curve:
+    the vectorized function, how to draw random parameters, how far t
+    advances per frame and how curve units map to pixels.
+    """
+
+    def __init__(self, name, title, function, parameters, t_step, scale=1, unit=None,
+                 first_frame=0, flip_y=True, periods=None):
+        self.name = name
+        self.title = title
+        self.function = function        # f(t, **params) -> x, y
+        self.parameters = parameters    # parameters(rng) -> dict of params
+        self.t_step = t_step            # t_step(fps, frames, params) -> t per frame
+        self.scale = scale              # Pixels per curve unit
+        self.unit = unit                # unit(params) -> divisor for scale (e.g. R)
+        self.first_frame = first_frame  # First frame index (skips singular t = 0)
+        self.flip_y = flip_y
+        self.periods = periods          # periods(params) -> candidate t periods, shortest first
+
+    # x, y of the curve at t, through a cache.SampleCache if one is given.
+    # Always rounded to float32, the precision the cache stores, so the
+    # pixels do not depend on whether the cache is on.
+    def coordinates(self, params, t, cache=None):
+        if cache is not None:
+            return cache.sample(self.name, params, t, lambda t: self.function(t, **params))
+        x, y = np.array(self.function(t, **params), dtype=np.float32)
+        return x, y
+
+    # Sample the curve at frame indices and map it to pixel coordinates,
+    # through a cache.SampleCache if one is given
+    def sample(self, frames, params, center, scale, t_step, cache=None):
+        x, y = self.coordinates(params, t_step * frames, cache)
+        if self.unit is not None:
+            scale = scale / self.unit(params)
+        return curves.to_pixels(x, y, center, scale, self.flip_y)
+
+    def fit(self, frames, params, size, t_step, margin=FIT_MARGIN, cache=None):
+        """
+        Center and scale (in the units sample() takes) that fit the curve
+        at these frame positions into a frame of size (width, height),
+        with `margin` of the frame left empty on every side. Returns None
+        if the curve has no defined point there.
+        """
+        x, y = self.coordinates(params, t_step * frames, cache)
+        defined = np.isfinite(x) & np.isfinite(y)
+        if not defined.any():
+            return None
+        x, y = x[defined], y[defined]
+        if self.flip_y:
+            y = -y   # Pixel rows grow downwards
+        width, height = size
+        left, right, top, bottom = x.min(), x.max(), y.min(), y.max()
+        # A straight horizontal or vertical curve only limits the other axis
+        spans = [(1 - 2 * margin) * length / extent for length, extent in
+                 ((width, right - left), (height, bottom - top)) if extent > 0]
+        scale = min(spans) if spans else 1.0
+        center = (round(width / 2 - scale * (left + right) / 2), round(height / 2 - scale * (top + bottom) / 2))
+        if self.unit is not None:
+            scale = scale * self.unit(params)
+        return center, float(scale)
+
+    def period_frames(self, params, scale, t_step, frames, tolerance=0.5):
+        """
+        Frames after which the path retraces itself, or None if it is not
+        known to close within `frames` frames. A period only counts if
+        every lap up to the last frame stays within `tolerance` pixels of
+        the first one at this scale; nearly closed roulettes drift a
+        little further with each lap. The path is sampled once per frame,
+        so the result is the fewest laps that last a whole number of
+        frames: laps in between sample the curve at new points and still
+        fill in its shape (a rose with a period of 42.86 frames only
+        repeats its samples after 7 laps, 300 frames).
+        """
+        if self.periods is None:
+            return None
+        if self.unit is not None:
+            scale = scale / self.unit(params)
+        last_t = t_step * frames
+        for period in self.periods(params):
+            if period >= last_t:
+                break
+            t = np.linspace(0, period, PERIOD_SAMPLES)
+            x, y = self.function(t, **params)
+            error = 0
+            for laps in {1, int(last_t // period)}:
+                x_later, y_later = self.function(t + laps * period, **params)
+                error = max(error, np.nanmax(np.hypot(x_later - x, y_later - y)) * scale)
+            if error >= tolerance:
+                continue
+            for laps in range(1, int(last_t // period) + 1):
+                lap_frames = laps * period / t_step
+                if abs(lap_frames - round(lap_frames)) < FRAME_EPSILON:
+                    return round(lap_frames)
+        return None
+
+
+# Registered curves by name
+CURVES = {}
+
+
+def register(curve):
+    CURVES[curve.name] = curve
+    return curve
+
+
+def get_curve(name):
+    try:
+        return CURVES[name]
+    except KeyError:
+        raise ValueError(f"Unknown curve '{name}', choose from: {', '.join(sorted(CURVES))}")
+
+
+# Whole turns of t, for roulettes whose circles' ratio is (close to) p / q
+def whole_turns(params):
+    return (2 * math.pi * q for q in range(1, MAX_TURNS + 1))
+
+
+# Common t progressions
+def full_turns(turns):
+    return lambda fps, frames, params: 2 * math.pi * turns / frames
+
+
+def per_frame(step):
+    return lambda fps, frames, params: step
+
+
+def _viviani_2d(t, a):
+    return curves.project_to_2d(*curves.viviani_curve(t, a))
+
+
+register(Curve('archimedes', 'Spiral of Archimedes', curves.spiral_archimedes,
+               lambda rng: dict(a=rng.uniform(0, 10), b=rng.uniform(1, 10)),
+               per_frame(1 / 10.0), scale=10))
+register(Curve('astroid', 'Astroid Curve', curves.astroid_curve,
+               lambda rng: dict(a=rng.uniform(100, 300)),
+               full_turns(1)))
+register(Curve('butterfly', 'Butterfly Curve', curves.butterfly_curve,
+               lambda rng: dict(),
+               per_frame(1 / 60.0), scale=150))
+register(Curve('cardioid', 'Cardioid Curve', curves.cardioid_curve,
+               lambda rng: dict(a=rng.uniform(100, 300)),
+               full_turns(1)))
+register(Curve('cissoid', 'Cissoid of Diocles', curves.cissoid_diocles,
+               lambda rng: dict(a=rng.uniform(100, 200)),
+               full_turns(0.25), first_frame=1))  # Quarter turn avoids the asymptote
+register(Curve('cloverleaf', 'Cloverleaf Curve', curves.cloverleaf_curve,
+               lambda rng: dict(n=rng.randint(2, 5)),
+               per_frame(1 / 30.0), scale=300))
+register(Curve('deltoid', 'Deltoid Curve', curves.deltoid_curve,
+               lambda rng: dict(R=rng.uniform(100, 300)),
+               full_turns(1)))
+register(Curve('epicycloid', 'Epicycloid Curve', curves.epicycloid_curve,
+               lambda rng: dict(R=rng.uniform(50, 200), r=rng.uniform(10, 100)),
+               full_turns(10), scale=200, unit=lambda params: params['R'],
+               periods=whole_turns))
+register(Curve('harmonograph', 'Harmonograph Curve', curves.harmonograph_curve,
+               lambda rng: dict(A1=rng.uniform(50, 150), A2=rng.uniform(50, 150),
+                                f1=rng.uniform(0.5, 2), f2=rng.uniform(0.5, 2),
+                                d1=rng.uniform(0.01, 0.05), d2=rng.uniform(0.01, 0.05),
+                                p1=rng.uniform(0, math.pi), p2=rng.uniform(0, math.pi)),
+               lambda fps, frames, params: 1 / fps, scale=100))
+register(Curve('heart', 'Heart Curve', curves.heart_curve,
+               lambda rng: dict(),
+               full_turns(1), scale=20, flip_y=False))  # heart_curve already flips y
+register(Curve('hypotrochoid', 'Hypotrochoid Curve', curves.hypotrochoid_curve,
+               lambda rng: dict(R=rng.uniform(100, 300), r=rng.uniform(10, 100), d=rng.uniform(50, 150)),
+               full_turns(10), scale=200, unit=lambda params: params['R'],
+               periods=whole_turns))
+register(Curve('lemniscate', 'Lemniscate of Bernoulli', curves.lemniscate_curve,
+               lambda rng: dict(a=rng.uniform(100, 300)),
+               full_turns(1)))
+register(Curve('lissajous', 'Lissajous Curve', curves.lissajous_curve,
+               lambda rng: dict(A=rng.uniform(0.5, 2), B=rng.uniform(0.5, 2),
+                                a=rng.randint(1, 5), b=rng.randint(1, 5),
+                                delta=rng.uniform(0, 2 * math.pi)),
+               per_frame(1 / 60.0), scale=300,
+               periods=lambda params: [2 * math.pi]))
+register(Curve('logarithmic', 'Logarithmic Spiral', curves.logarithmic_spiral,
+               lambda rng: dict(a=rng.uniform(0.1, 2), b=rng.uniform(0.1, 0.5)),
+               per_frame(1 / 30.0), scale=10))
+register(Curve('nephroid', 'Nephroid Curve', curves.nephroid_curve,
+               lambda rng: dict(a=rng.uniform(100, 200)),
+               full_turns(1)))
+register(Curve('rose', 'Rose Curve', curves.rose_curve,
+               lambda rng: dict(k=rng.randint(1, 10), a=rng.uniform(50, 300)),
+               lambda fps, frames, params: 2 * math.pi * params['k'] / frames,
+               periods=lambda params: [math.pi, 2 * math.pi]))
+register(Curve('superellipse', 'Superellipse Curve', curves.superellipse_curve,
+               lambda rng: dict(a=rng.uniform(100, 300), b=rng.uniform(100, 300), n=rng.uniform(2, 4)),
+               full_turns(1)))
+register(Curve('viviani', "Viviani's Curve", _viviani_2d,
+               lambda rng: dict(a=rng.uniform(100, 200)),
+               full_turns(2)))
@@ -0,0 +1,543 @@
+import itertools
+import math
+import os
+
+import cv2
+import numpy as np
+
+from curvas.background import gradient_background
+from curvas.cache import default_cache
+from curvas.checkpoint import Checkpoint, interrupted_seed
+from curvas.clip import path_segments
+from curvas.colors import palette_table
+from curvas.jobs import concatenate_videos, part_file, run_jobs
+from curvas.layer import CurveLayer, IndexLayer
+from curvas.overlay import parameter_text, style_overlay
+from curvas.preview import Preview
+from curvas.profiler import JobProgress, Profiler
+from curvas.registry import get_curve
+from curvas.seeds import new_seed, seeded_parameters, simulation_seeds
+from curvas.sampling import ADAPTIVE, refine_positions
+from curvas.styles import get_style, pick_strategy
+from curvas.writer import AsyncVideoWriter, FramePool, default_encoder, open_writer
+
+
+# Read-only background image: a cached colormap gradient or a solid color
+def make_background(background, width, height):
+    if isinstance(background, int):
+        return gradient_background(width, height, background)
+    image = np.full((height, width, 3), background, dtype=np.uint8)
+    image.flags.writeable = False
+    return image
+
+
+# Line colors for n steps of a style as an (n, 3) uint8 lookup table, or
+# for the given steps only (an array of step numbers out of n). With
+# color_buckets the palette is cut into that many bands of one color.
+def style_table(style, n, total=None, steps=None):
+    if style['palette'] is None:
+        return np.full((n if steps is None else len(steps), 3), style['color'], dtype=np.uint8)
+    if style['color_buckets'] and n > style['color_buckets']:
+        band = -(-n // style['color_buckets'])
+        steps = (np.arange(n) if steps is None else np.asarray(steps)) // band * band
+    return palette_table(style['palette'], n, total, steps)
+
+
+# Blend the curve over the background (or copy it) and add the static
+# overlay (axes, grid, text), if any. The frame is written into `out` when
+# given, a new array otherwise.
+def composite(canvas, background, style, overlay, out=None):
+    if style['blend'] is not None:
+        background_weight, curve_weight = style['blend']
+        frame = cv2.addWeighted(background, background_weight, canvas, curve_weight, 0, dst=out)
+    else:
+        frame = _copy(canvas, out)
+    if overlay is not None:
+        overlay.apply(frame)
+    return frame
+
+
+# Copy of an image, into `out` when given
+def _copy(image, out=None):
+    if out is None:
+        return image.copy()
+    np.copyto(out, image)
+    return out
+
+
+# Segments of a path clipped to the frame, with room for the line thickness
+def _segments(path, style, background):
+    height, width = background.shape[:2]
+    return path_segments(*path, width, height, style['thickness'])
+
+
+# Blended styles draw on black and composite; the others draw on the background
+def _new_layer(style, background):
+    height, width = background.shape[:2]
+    return CurveLayer(width, height, (0, 0, 0) if style['blend'] is not None else background)
+
+
+# Buffer for the next frame: from the pool if there is one
+def _frame_buffer(pool):
+    return None if pool is None else pool.take()
+
+
+# The strategies below draw the curve and yield (canvas, dirty) for every
+# frame: dirty is the (left, top, right, bottom) box of the canvas that
+# changed since the previous frame, or None if nothing was drawn.
+
+# Rows of several arrays as tuples of Python values, from index `first` on.
+# They are converted a block at a time, so a long path never exists as
+# one big list of Python objects.
+def _rows(arrays, first=0, block=4096):
+    for offset in range(first, len(arrays[0]), block):
+        yield from zip(*(array[offset:offset + block].tolist() for array in arrays))
+
+
+# Frame of each point of a path, and how many points are drawn by the end
+# of each of `frames` frames. owners=None means one point per frame. A path
+# that ends before the last frame (a closed curve) stops drawing there.
+def _frame_ends(owners, points, frames):
+    if owners is None:
+        return np.arange(points), np.minimum(np.arange(1, frames + 1), points)
+    return owners, np.searchsorted(owners, np.arange(frames), side='right')
+
+
+# Strategy: persistent layer, only the newest segments are drawn each frame
+# (one, unless adaptive sampling added points between frames; `owners`
+# then holds the frame of each point). The segments before `start` are
+# drawn into the layer as one batch, which rebuilds the layer a chunk
+# starts from without compositing or encoding anything.
+def _incremental_frames(path, frames, style, background, profiler, start=0, stop=None, owners=None):
+    owners, ends = _frame_ends(owners, len(path[0]), frames)
+    colors = style_table(style, len(ends))[owners]
+    layer = _new_layer(style, background)
+    starts, stops, drawn = _segments(path, style, background)
+    first = ends[start - 1] if start else 0
+    layer.add_segments(starts[:first], stops[:first], colors[:first], drawn[:first], style['thickness'])
+    segments = _rows((starts[:, 0], starts[:, 1], stops[:, 0], stops[:, 1], drawn, colors), first)
+    for end in ends[start:stop].tolist():
+        for x0, y0, x1, y1, is_drawn, color in itertools.islice(segments, end - first):
+            if is_drawn:
+                layer.add_segment((x0, y0), (x1, y1), color, style['thickness'])
+        first = end
+        profiler.lap('draw')
+        yield layer.canvas, layer.take_dirty()
+
+
+# Strategy: every segment's color depends on how long the curve currently
+# is, so the whole curve is recolored each frame. Segments are rasterized
+# once into a segment-index buffer and each frame is painted from it with
+# a palette lookup. Frames before `start` only fill the buffer.
+def _recolor_frames(path, frames, style, background, profiler, start=0, stop=None, owners=None):
+    height, width = background.shape[:2]
+    owners, ends = _frame_ends(owners, len(path[0]), frames)
+    layer = IndexLayer(width, height, len(path[0]),
+                       (0, 0, 0) if style['blend'] is not None else background)
+    starts, stops, drawn = _segments(path, style, background)
+    stale = False   # Segments were added since the last paint
+    first = 0
+    segments = _rows((starts[:, 0], starts[:, 1], stops[:, 0], stops[:, 1], drawn))
+    for i, end in enumerate(ends[:stop].tolist()):
+        changed = False
+        for x0, y0, x1, y1, is_drawn in itertools.islice(segments, end - first):
+            if is_drawn:
+                layer.add_segment((x0, y0), (x1, y1), style['thickness'])
+                changed = stale = True
+        first = end
+        if i < start:
+            continue
+        if stale:
+            # Segments are numbered from 1, so the palette has one more color
+            layer.paint(lambda numbers: style_table(style, layer.segments + 1, steps=numbers))
+            stale = False
+        profiler.lap('draw')
+        # Repainting recolors the whole curve
+        yield layer.canvas, (0, 0, width, height) if changed else None
+
+
+# Strategy: the path is revealed a little further every frame. It is
+# sampled once, on a grid fine enough for the last frame, and each frame
+# only draws the points revealed since the previous one. A palette spread
+# over the revealed part shifts every frame, so colored paths go through a
+# segment-index buffer numbered by point and are repainted each frame.
+def _reveal_frames(path, positions, frame_count, style, background, profiler, start=0, stop=None):
+    height, width = background.shape[:2]
+    starts, stops, drawn = _segments(path, style, background)
+    if style['palette'] is None:
+        layer = _new_layer(style, background)
+        colors = style_table(style, len(drawn))
+    else:
+        layer = IndexLayer(width, height, len(drawn),
+                           (0, 0, 0) if style['blend'] is not None else background)
+    revealed = 0
+    stale = False   # Points were revealed since the last paint
+    for i in range(frame_count if stop is None else min(stop, frame_count)):
+        count = int(np.searchsorted(positions, i, side='right'))
+        if style['palette'] is None:
+            layer.add_segments(starts[revealed:count], stops[revealed:count], colors[revealed:count],
+                               drawn[revealed:count], style['thickness'])
+        else:
+            stale = stale or count > revealed
+            for k in np.flatnonzero(drawn[revealed:count]).tolist():
+                layer.add_segment(tuple(starts[revealed + k].tolist()), tuple(stops[revealed + k].tolist()),
+                                  style['thickness'], number=revealed + k)
+        revealed = count
+        if i < start:
+            continue
+        if style['palette'] is not None and stale:
+            layer.paint(lambda numbers: style_table(style, count, steps=numbers))
+            stale = False
+            dirty = (0, 0, width, height)
+        else:
+            dirty = layer.take_dirty() if style['palette'] is None else None
+        profiler.lap('draw')
+        yield layer.canvas, dirty
+
+
+# Strategy: the visible part of the path is resampled and drawn from
+# scratch every frame, as one batched path. Only needed for reveals that
+# zoom, where the points move from one frame to the next.
+def _resample_frames(sample, frame_count, style, background, profiler, start=0, stop=None):
+    layer = _new_layer(style, background)
+    for i in range(start, frame_count if stop is None else min(stop, frame_count)):
+        n = style['samples'] or i
+        positions = np.linspace(0, max(i, 1), num=n)
+        if style['adaptive'] is not None:
+            positions = refine_positions(lambda p: sample(p, i), positions, *style['adaptive'])
+            n = len(positions)
+        x_pixels, y_pixels, valid = sample(positions, i)
+        profiler.lap('sample')
+        layer.clear()
+        starts, stops, drawn = _segments((x_pixels, y_pixels, valid), style, background)
+        layer.add_segments(starts, stops, style_table(style, n), drawn, style['thickness'])
+        profiler.lap('draw')
+        yield layer.canvas, layer.take_dirty()
+
+
+# Blend the dirty box of the canvas over the background, into `blended`
+def _blend_region(blended, canvas, background, style, dirty):
+    left, top, right, bottom = dirty
+    background_weight, curve_weight = style['blend']
+    cv2.addWeighted(background[top:bottom, left:right], background_weight,
+                    canvas[top:bottom, left:right], curve_weight, 0, dst=blended[top:bottom, left:right])
+
+
+# Composite the canvases of a strategy into frames. With repeats, a frame
+# whose canvas did not change is yielded as None instead: the previous
+# frame can be shown and encoded again. The first frame is always drawn.
+# Blended styles keep the blend of the whole canvas from frame to frame
+# and only blend the dirty box again, then copy it into the frame.
+def _composited(canvases, background, style, overlay, profiler, pool, repeats):
+    first = True
+    blended = None
+    for canvas, dirty in canvases:
+        if repeats and dirty is None and not first:
+            yield None
+            continue
+        first = False
+        if style['blend'] is not None:
+            if blended is None:
+                blended = composite(canvas, background, style, None)
+            elif dirty is not None:
+                _blend_region(blended, canvas, background, style, dirty)
+            canvas = blended
+        frame = _copy(canvas, _frame_buffer(pool))
+        if overlay is not None:
+            overlay.apply(frame)
+        profiler.lap('composite')
+        yield frame
+
+
+# Frames of one simulation (one parameter set), optionally only the
+# frames start..stop-1 of it. The profiler, if given, is charged with the
+# time of each stage; frames are composited into buffers from the pool, if
+# given, which must not be handed out again before the frame is used. With
+# repeats=True, frames identical to the previous one come out as None.
+# A style with `adaptive` set adds points between frames where the curve
+# moves fast or bends (see sampling.refine_positions). A single-color
+# curve that closes is sampled and drawn for one lap only; the frames
+# after that leave the canvas as it is. With fit=True the scale and center
+# are chosen so the whole path fits in the frame (see Curve.fit).
+def simulation_frames(curve, params, style, background, frame_count, fps, scale, scale_growth=0.0,
+                      t_step=None, start=0, stop=None, profiler=None, pool=None, repeats=False, fit=False):
+    if profiler is None:
+        profiler = Profiler(None, 0, enabled=False)
+    height, width = background.shape[:2]
+    center = (width // 2, height // 2)
+    if t_step is None:
+        t_step = curve.t_step(fps, frame_count, params)
+    if fit:
+        # The whole path in one call, to frame it at the starting scale
+        fitted = curve.fit(np.arange(curve.first_frame, frame_count), params, (width, height), t_step,
+                           cache=default_cache())
+        if fitted is not None:
+            center, scale = fitted
+    overlay = style_overlay(style, width, height, center, parameter_text(params))
+
+    # Sample positions (in frames) at the scale reached by frame i. Whole
+    # paths go through the sample cache, per-frame resampling does not.
+    def sample(positions, i, cache=None):
+        return curve.sample(positions, params, center, scale + scale_growth * (i + 1), t_step, cache)
+
+    # Frames after which a closed curve repeats its samples, if later laps
+    # would draw nothing new
+    period = None
+    if style['palette'] is None and not scale_growth:
+        period = curve.period_frames(params, scale, t_step, frame_count)
+
+    strategy = pick_strategy(style)
+    if strategy == 'reveal' and scale_growth:
+        canvases = _resample_frames(sample, frame_count, style, background, profiler, start, stop)
+    elif strategy == 'reveal':
+        # One point per frame, or more if the style asks for more samples
+        positions = np.linspace(0, frame_count - 1, num=max(style['samples'] or 0, frame_count))
+        # Laps only repeat their samples at one point per frame
+        if period is not None and len(positions) == frame_count:
+            positions = positions[:np.searchsorted(positions, period) + 1]
+        if style['adaptive'] is not None:
+            positions = refine_positions(lambda p: sample(p, 0), positions, *style['adaptive'])
+        path = sample(positions, 0, default_cache())
+        profiler.lap('sample')
+        canvases = _reveal_frames(path, positions, frame_count, style, background, profiler, start, stop)
+    else:
+        frames = np.arange(curve.first_frame, frame_count)
+        if period is not None:
+            frames = frames[:math.ceil(period) + 1]
+        owners = None
+        if style['adaptive'] is not None:
+            # Points between frames f - 1 and f are drawn with frame f
+            frames = refine_positions(lambda p: sample(p, p), frames, *style['adaptive'])
+            owners = np.ceil(frames).astype(np.int64) - curve.first_frame
+        path = sample(frames, frames, default_cache())
+        profiler.lap('sample')
+        if strategy == 'recolor':
+            canvases = _recolor_frames(path, frame_count - curve.first_frame, style, background, profiler,
+                                       start, stop, owners)
+        else:
+            canvases = _incremental_frames(path, frame_count - curve.first_frame, style, background, profiler,
+                                           start, stop, owners)
+    return _composited(canvases, background, style, overlay, profiler, pool, repeats)
+
+
+# Video tags naming the curve and the seed and parameters of every simulation
+def render_metadata(curve, title, param_sets, seeds=None):
+    simulations = []
+    for n, params in enumerate(param_sets):
+        text = ', '.join(parameter_text(params)) or 'no parameters'
+        simulations.append(text if seeds is None else f'seed {seeds[n]}: {text}')
+    return dict(title=title or curve.title, comment=f'{curve.name}; ' + '; '.join(simulations))
+
+
+# Shortest chunk worth a process of its own: one minute at 60 fps
+MIN_CHUNK_FRAMES = 3600
+
+
+# Split frames 0..frame_count-1 into `chunks` contiguous (start, stop) ranges
+def chunk_ranges(frame_count, chunks):
+    bounds = [frame_count * n // chunks for n in range(chunks + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+# Cut a (start, stop) range into consecutive segments of at most `size` frames
+def split_range(frame_range, size):
+    start, stop = frame_range
+    return [(first, min(first + size, stop)) for first in range(start, stop, size)]
+
+
+def render_part(curve, param_sets, output_file, fps, frame_count, resolution, style, scale=None,
+                scale_growth=0.0, t_step=None, thickness=None, adaptive=None, fit=False, frame_range=None,
+                encoder=None, title=None, headless=None, metadata=None):
+    """
+    Render the given parameter sets one after another into a single file.
+    With frame_range=(start, stop) only those frames of the (single)
+    simulation are written; this is what each chunk worker runs.
+    Returns None when the preview was closed with 'q' before the end.
+    With CURVAS_PROFILE set, stage timings are reported (see profiler.py).
+    encoder overrides the video encoder settings and metadata sets the
+    container tags (see writer.open_writer).
+    """
+    curve = get_curve(curve)
+    style = get_style(style)
+    if thickness is not None:
+        style['thickness'] = thickness
+    if adaptive is not None:
+        style['adaptive'] = ADAPTIVE if adaptive is True else adaptive or None
+    if scale is None:
+        scale = curve.scale
+    start, stop = frame_range or (0, None)
+    width, height = resolution
+    background = make_background(style['background'], width, height)
+    profiler = Profiler(output_file, len(param_sets) * (min(stop or frame_count, frame_count) - start))
+
+    # Video writer setup (encodes on a background thread and recycles the frames)
+    pool = FramePool((height, width, 3))
+    video_writer = AsyncVideoWriter(open_writer(output_file, fps, (width, height), encoder, metadata),
+                                    profiler=profiler, pool=pool)
+
+    # Preview window (skipped in headless mode)
+    preview = Preview(title or curve.title, headless=headless)
+
+    quit_requested = False
+    try:
+        for sim_params in param_sets:
+            frames = simulation_frames(curve, sim_params, style, background, frame_count, fps,
+                                       scale, scale_growth, t_step, start, stop, profiler, pool, repeats=True,
+                                       fit=fit)
+            for frame in frames:
+                # None: nothing changed, the previous frame is encoded again
+                if frame is not None:
+                    preview.show(frame)
+                profiler.lap('preview')
+                if frame is None:
+                    video_writer.repeat()
+                else:
+                    video_writer.write(frame)
+                profiler.lap('write')
+                quit_requested = preview.quit_requested()
+                profiler.lap('preview')
+                profiler.frame_done(repeated=frame is None)
+                if quit_requested:
+                    break
+            if quit_requested:
+                break
+    finally:
+        # Clean up (flushing the encoder counts as writing)
+        video_writer.release()
+        profiler.lap('write')
+        preview.close()
+    print(f'Video saved as {output_file}')
+    profiler.summary()
+    return None if quit_requested else output_file
+
+
+def render(curve, fps=60, duration=10, resolution=(1920, 1080), style='plain', output_file=None,
+           params=None, scale=None, scale_growth=0.0, t_step=None, thickness=None, adaptive=None, fit=False,
+           simulations=1, workers=None, chunks=None, title=None, headless=None,
+           resumable=False, segment_frames=MIN_CHUNK_FRAMES, encoder=None, seed=None):
+    """
+    Render an animation of a registered curve to a video file.
+    Each of the `simulations` runs draws random parameters (unless `params`
+    is given) from its own seed: seed, seed + 1, ... or a fresh seed when
+    none is given. The seeds and parameters are printed and stored in the
+    video's comment tag, and '{seed}' in output_file is replaced by the
+    first seed. Every run is appended to the same file. Unless workers=1
+    the work is spread over a process pool and the parts joined in order:
+    several simulations get one part each, and a single long simulation is
+    cut into `chunks` (by default one per core, at least MIN_CHUNK_FRAMES
+    frames each) whose starting layers are rebuilt from the sampled path.
+
+    With resumable=True every simulation is also cut into closed segments
+    of `segment_frames` frames and a checkpoint next to the output file
+    records the parameters and the finished segments. Running the same
+    render again after a crash, Ctrl-C or 'q' only renders what is missing;
+    without a seed, a '{seed}' output name is filled in with the seed of
+    the checkpoint left behind, if any.
+
+    adaptive=True adds points where the curve moves fast or bends sharply
+    (see curvas/sampling.py); a (max length, max turn, budget) tuple sets
+    the limits, False turns it off and None keeps the style's setting.
+    fit=True samples each path once up front and picks the scale and
+    center that show all of it; scale is then ignored.
+
+    encoder overrides the video encoder settings (codec, preset, crf,
+    threads, pix_fmt) that otherwise come from the environment; see
+    curvas/writer.py. ffmpeg is used when installed, OpenCV otherwise.
+    """
+    curve = get_curve(curve)
+    if output_file is None:
+        output_file = f'{curve.name}_curve.mp4' if params is not None else f'{curve.name}_curve_{{seed}}.mp4'
+    frame_count = int(duration * fps)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # Parameters are drawn here, once, so every worker renders the same ones
+    seeds = None
+    if params is None:
+        first_seed = seed
+        if resumable and first_seed is None and '{seed}' in output_file:
+            # Without a seed the file name is new every time: pick up the
+            # seed of an interrupted render of this name instead
+            first_seed = interrupted_seed(output_file)
+        seeds = simulation_seeds(first_seed, simulations)
+        param_sets = [seeded_parameters(curve, sim_seed) for sim_seed in seeds]
+        output_file = output_file.replace('{seed}', str(seeds[0]))
+    else:
+        param_sets = [params] * simulations
+    settings = dict(curve=curve.name, fps=fps, frame_count=frame_count, resolution=resolution, style=style,
+                    scale=scale, scale_growth=scale_growth, t_step=t_step, thickness=thickness,
+                    adaptive=adaptive, fit=fit, encoder=encoder)
+
+    # Units of work: (simulation, (start, stop)), each rendered into its own part
+    ranges = [(0, frame_count)]
+    requested_chunks = chunks
+    if workers > 1 and simulations == 1:
+        if chunks is None:
+            chunks = min(workers, frame_count // MIN_CHUNK_FRAMES)
+        if chunks > 1:
+            ranges = chunk_ranges(frame_count, chunks)
+    if resumable:
+        ranges = [segment for frame_range in ranges for segment in split_range(frame_range, segment_frames)]
+    units = [(sim, frame_range) for sim in range(simulations) for frame_range in ranges]
+
+    checkpoint = None
+    if resumable:
+        # A checkpoint left by an interrupted run brings back its parameters
+        # and units: a default `chunks` depends on the workers, which may differ now
+        checkpoint = Checkpoint.load_or_create(output_file, dict(settings, seed=seed, chunks=requested_chunks,
+                                                                 segment_frames=segment_frames),
+                                               param_sets, [(sim, *frame_range) for sim, frame_range in units],
+                                               seeds)
+        param_sets, seeds, units = checkpoint.param_sets, checkpoint.seeds, checkpoint.units
+    metadata = render_metadata(curve, title, param_sets, seeds)
+    print(f"{output_file}: {metadata['comment']}")
+    if not resumable and (workers == 1 or len(units) == 1):
+        return render_part(param_sets=param_sets, output_file=output_file, title=title,
+                           headless=headless, metadata=metadata, **settings)
+    pending = [n for n in range(len(units)) if checkpoint is None or not checkpoint.is_done(n)]
+    if workers > 1 and 'threads' not in dict(default_encoder(), **(encoder or {})):
+        # Parts encode side by side: share the cores among the processes
+        # that actually run (no more than there are parts left)
+        running = max(1, min(workers, len(pending)))
+        settings['encoder'] = dict(encoder or {}, threads=max(1, (os.cpu_count() or 1) // running))
+    jobs = [dict(settings, param_sets=[param_sets[sim]], frame_range=frame_range,
+                 output_file=part_file(output_file, n), headless=True, metadata=metadata)
+            for n, (sim, frame_range) in enumerate(units)]
+    parts = [job['output_file'] for job in jobs]
+    # Progress and ETA of the whole job, as each part finishes
+    progress = JobProgress(output_file, {n: units[n][1][1] - units[n][1][0] for n in pending})
+
+    if workers == 1:
+        # One process: keep the preview, and let 'q' stop between segments
+        for n in pending:
+            if render_part(**dict(jobs[n], title=title, headless=headless)) is None:
+                print(f'Stopped; render {output_file} again to resume')
+                return None
+            checkpoint.mark_done(n)
+            progress.part_done(n)
+    else:
+        def on_done(index, result):
+            if checkpoint is not None:
+                checkpoint.mark_done(pending[index])
+            progress.part_done(pending[index])
+        run_jobs(render_part, [jobs[n] for n in pending], workers, on_done)
+
+    concatenate_videos(parts, output_file, metadata)
+    if checkpoint is not None:
+        checkpoint.remove()
+    print(f'Video saved as {output_file}')
+    progress.summary()
+    return output_file
+
+
+def render_many(jobs, workers=None):
+    """
+    Render independent jobs, each a dict of render() arguments with its own
+    output_file, across a process pool (all cores by default). Each job
+    renders on a single process.
+    """
+    jobs = [dict(job, headless=True, workers=1) for job in jobs]
+    for job in jobs:
+        # Seeded here so no two jobs draw the same parameters
+        if job.get('params') is None and job.get('seed') is None:
+            job['seed'] = new_seed()
+    return run_jobs(render, jobs, workers)
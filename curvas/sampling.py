@@ -0,0 +1,47 @@
+import numpy as np
+
+# (max segment length in pixels, max turn between segments in radians,
+#  max points per frame) used when adaptive sampling is switched on
+ADAPTIVE = (4, 0.1, 16)
+
+# Segments shorter than this (in pixels) show no facets, whatever their turn
+MIN_TURN_LENGTH = 2
+
+
+def refine_positions(sample, positions, max_length, max_turn, budget):
+    """
+    Add sample positions between the given ones (sorted, in frames) where
+    the curve moves fast or bends sharply on screen. `sample(positions)`
+    returns the pixel coordinates and validity of the curve there, as
+    Curve.sample() does. Every interval is cut into equal steps until its
+    segments are at most max_length pixels long and turn at most max_turn
+    radians from their neighbours, but never into more than `budget`
+    steps per frame. The given positions are all kept.
+    """
+    positions = np.asarray(positions, dtype=float)
+    if len(positions) < 2:
+        return positions
+    x_pixels, y_pixels, valid = sample(positions)
+    dx = np.diff(x_pixels).astype(float)
+    dy = np.diff(y_pixels).astype(float)
+    length = np.hypot(dx, dy)
+
+    # Turn at each inner point, charged to the segments on both sides of it
+    heading = np.arctan2(dy, dx)
+    turn = np.abs(np.angle(np.exp(1j * np.diff(heading))))
+    turn[(length[:-1] < MIN_TURN_LENGTH) | (length[1:] < MIN_TURN_LENGTH)] = 0
+    segment_turn = np.zeros(len(length))
+    segment_turn[:-1] = turn
+    segment_turn[1:] = np.maximum(segment_turn[1:], turn)
+
+    pieces = np.ceil(np.maximum(length / max_length, segment_turn / max_turn))
+    steps = np.diff(positions)
+    pieces = np.clip(pieces, 1, np.maximum(np.floor(budget * steps), 1)).astype(np.int64)
+    # Undefined ends: nothing to smooth, and the gap must stay where it is
+    pieces[~(valid[:-1] & valid[1:])] = 1
+
+    # Interval j contributes positions[j] + m * steps[j] / pieces[j], m < pieces[j]
+    first = np.repeat(np.cumsum(pieces) - pieces, pieces)
+    m = np.arange(first.size) - first
+    refined = np.repeat(positions[:-1], pieces) + m * np.repeat(steps / pieces, pieces)
+    return np.append(refined, positions[-1])
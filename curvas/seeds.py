@@ -0,0 +1,20 @@
+import random
+
+
+# A fresh seed, short enough to read in a file name
+def new_seed():
+    return random.SystemRandom().randrange(2 ** 31)
+
+
+# Seeds of `count` simulations: seed, seed + 1, ... from a fresh seed when
+# None, so the first one alone is enough to render all of them again
+def simulation_seeds(seed, count):
+    if seed is None:
+        seed = new_seed()
+    return [seed + n for n in range(count)]
+
+
+# Parameters of a curve drawn from their own random generator, never
+# from the global one, so the same seed gives the same curve anywhere
+def seeded_parameters(curve, seed):
+    return curve.parameters(random.Random(seed))
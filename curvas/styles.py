@@ -0,0 +1,65 @@
+import cv2
+
+from curvas.layer import AXIS_COLOR
+from curvas.sampling import ADAPTIVE
+
+# Defaults shared by every style
+DEFAULT_STYLE = dict(
+    background=(255, 255, 255),  # BGR color, or an OpenCV colormap for a gradient
+    color=(0, 0, 0),             # Fixed line color, used when palette is None
+    palette=None,                # Name of a curvas.colors palette
+    thickness=1,
+    blend=None,                  # (background weight, curve weight) for cv2.addWeighted
+    axes=None,                   # Axis color, None to skip the axes
+    grid=None,                   # (spacing in pixels, color) of a background grid
+    ticks=None,                  # (spacing, half length) of tick marks on the axes
+    labels=None,                 # Color of the parameter values printed top left
+    watermark=None,              # (text, color) printed bottom right
+    recolor=False,               # Every segment's color depends on the current length
+    reveal=False,                # Reveal the path up to the current frame, colors spread over it
+    samples=None,                # Points in the fully revealed path (None: one per frame)
+    color_buckets=None,          # Merge palette colors into this many bands (fewer draw calls)
+    adaptive=None,               # (max segment pixels, max turn radians, max points per frame)
+                                 # to add points where the curve is fast or bends, see sampling.py
+)
+
+# Style presets, named after the look of the original scripts
+STYLES = {
+    # Black line on white with axes (the *001 scripts)
+    'plain': dict(axes=AXIS_COLOR),
+    # Whole curve shifts color as it grows, over a twilight gradient (Epicycloid002-006)
+    'gradient': dict(background=cv2.COLORMAP_TWILIGHT, palette='sweep', thickness=2,
+                     blend=(0.6, 0.8), axes=AXIS_COLOR, recolor=True),
+    # Colored trail painted straight onto a twilight gradient (Epicycloid007/008)
+    'trail': dict(background=cv2.COLORMAP_TWILIGHT, palette='sweep', thickness=2, adaptive=ADAPTIVE),
+    # Thick cycling colors on black (Epicycloid009-011)
+    'neon': dict(background=(0, 0, 0), palette='cycle', thickness=20),
+    # Very thick rapidly cycling line blended over a jet gradient (mariposa003-005)
+    'glow': dict(background=cv2.COLORMAP_JET, palette='rapid', thickness=60,
+                 blend=(0.7, 0.8)),
+    # Black line on white over a grid, with tick marks and the parameter values
+    'annotated': dict(axes=AXIS_COLOR, grid=(100, (235, 235, 235)), ticks=(100, 6), labels=(90, 90, 90)),
+    # Black line on white that reveals a resampled path (lissajous, rhodhoid001, mariposa001)
+    'reveal': dict(axes=AXIS_COLOR, reveal=True),
+    # Colored resampled path blended over a jet gradient (mariposa002)
+    'reveal-glow': dict(background=cv2.COLORMAP_JET, palette='sweep', thickness=25,
+                        blend=(0.7, 0.8), axes=(50, 50, 50),
+                        reveal=True, samples=1000, color_buckets=250),
+}
+
+
+def get_style(name):
+    try:
+        return dict(DEFAULT_STYLE, **STYLES[name])
+    except KeyError:
+        raise ValueError(f"Unknown style '{name}', choose from: {', '.join(sorted(STYLES))}")
+
+
+# Fastest way to render a style: a persistent layer that only gets the new
+# segment each frame, unless the look needs the whole curve recolored
+def pick_strategy(style):
+    if style['reveal']:
+        return 'reveal'
+    if style['recolor']:
+        return 'recolor'
+    return 'incremental'
@@ -0,0 +1,182 @@
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Frames the encoder queue can hold before write() blocks
+QUEUE_SIZE = 8
+
+# Queue marker for AsyncVideoWriter.repeat()
+REPEAT = object()
+
+# Encoder settings, read from the environment so every script honours them:
+#   CURVAS_CODEC=libx264|libx265|ffv1|mp4v   (default libx264; mp4v uses OpenCV)
+#   CURVAS_PRESET=slow      ffmpeg preset (x264/x265)
+#   CURVAS_CRF=18           constant rate factor (x264/x265)
+#   CURVAS_THREADS=4        encoder threads (default: ffmpeg decides)
+
+# Defaults of each ffmpeg codec: preset, crf, the pixel format written
+# and any extra ffmpeg options
+CODECS = {
+    'libx264': dict(preset='medium', crf=18, pix_fmt='yuv420p', options=[]),
+    'libx265': dict(preset='medium', crf=22, pix_fmt='yuv420p', options=['-x265-params', 'log-level=error']),
+    'ffv1': dict(preset=None, crf=None, pix_fmt='bgr0', options=[]),    # Lossless, use a .mkv file
+}
+
+
+class FFmpegWriter:
+    """
+    Video writer that pipes raw BGR frames into an ffmpeg process, for the
+    codecs and settings cv2.VideoWriter does not offer. It has the same
+    write() / isOpened() / release() interface as cv2.VideoWriter.
+    """
+
+    def __init__(self, output_file, fps, frame_size, codec='libx264', preset=None, crf=None,
+                 threads=None, pix_fmt=None, metadata=None):
+        settings = CODECS[codec]
+        preset = preset or settings['preset']
+        crf = settings['crf'] if crf is None else crf
+        width, height = frame_size
+        command = ['ffmpeg', '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-pix_fmt', 'bgr24', '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+                   '-an', '-c:v', codec, '-pix_fmt', pix_fmt or settings['pix_fmt']] + settings['options']
+        if preset is not None:
+            command += ['-preset', preset]
+        if crf is not None:
+            command += ['-crf', str(crf)]
+        if threads is not None:
+            command += ['-threads', str(threads)]
+        for key, value in (metadata or {}).items():
+            command += ['-metadata', f'{key}={value}']
+        self.process = subprocess.Popen(command + [output_file], stdin=subprocess.PIPE)
+
+    def isOpened(self):
+        return self.process.poll() is None
+
+    def write(self, frame):
+        self.process.stdin.write(np.ascontiguousarray(frame).data)
+
+    # Close the pipe and wait for ffmpeg to finish the file
+    def release(self):
+        if not self.process.stdin.closed:
+            self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise OSError(f'ffmpeg exited with code {self.process.returncode}')
+
+
+# Encoder settings from the environment, as a dict for open_writer()
+def default_encoder():
+    encoder = dict(codec=os.environ.get('CURVAS_CODEC', 'libx264'), preset=os.environ.get('CURVAS_PRESET'))
+    if os.environ.get('CURVAS_CRF'):
+        encoder['crf'] = float(os.environ['CURVAS_CRF'])
+    if os.environ.get('CURVAS_THREADS'):
+        encoder['threads'] = int(os.environ['CURVAS_THREADS'])
+    return encoder
+
+
+# Video writer for the encoder settings (dict of FFmpegWriter arguments
+# overriding default_encoder()). Without ffmpeg, or with codec 'mp4v',
+# frames go to cv2.VideoWriter with the mp4v codec, which cannot store
+# the metadata (a dict of container tags such as title and comment).
+def open_writer(output_file, fps, frame_size, encoder=None, metadata=None):
+    encoder = dict(default_encoder(), **(encoder or {}))
+    codec = encoder.pop('codec')
+    if codec != 'mp4v' and shutil.which('ffmpeg'):
+        return FFmpegWriter(output_file, fps, frame_size, codec, metadata=metadata, **encoder)
+    return cv2.VideoWriter(output_file, cv2.VideoWriter_fourcc(*'mp4v'), fps, frame_size)
+
+
+class AsyncVideoWriter:
+    """
+    Video writer (cv2.VideoWriter or FFmpegWriter) running on a background
+    thread.
+    Frames go through a bounded queue: write() blocks when the encoder
+    falls behind, so drawing and encoding overlap without frames piling
+    up in memory. The writer keeps a reference to each frame until it is
+    encoded, so callers must not draw on a frame after passing it in.
+    repeat() encodes the last frame again without the caller keeping it.
+    Encoding time is reported to the optional profiler as 'encode', and
+    frames are handed back to the optional FramePool for reuse once a
+    newer frame has been encoded.
+    """
+
+    def __init__(self, writer, queue_size=QUEUE_SIZE, profiler=None, pool=None):
+        self.writer = writer
+        self.profiler = profiler
+        self.pool = pool
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.last_frame = None
+        self.error = None
+        self.thread = threading.Thread(target=self._encode, daemon=True)
+        self.thread.start()
+
+    # Encoder thread: drain the queue until the end marker arrives
+    def _encode(self):
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                break
+            if frame is REPEAT:
+                frame = self.last_frame
+            elif self.last_frame is not None and self.pool is not None:
+                self.pool.give(self.last_frame)
+            self.last_frame = frame
+            if self.error is None:
+                try:
+                    started = time.perf_counter()
+                    self.writer.write(frame)
+                    if self.profiler is not None:
+                        self.profiler.add('encode', time.perf_counter() - started)
+                except (cv2.error, OSError) as error:
+                    self.error = error
+        if self.last_frame is not None and self.pool is not None:
+            self.pool.give(self.last_frame)
+
+    def isOpened(self):
+        return self.writer.isOpened()
+
+    def write(self, frame):
+        if self.error is not None:
+            raise self.error
+        self.frames.put(frame)
+
+    # Encode the previous frame once more
+    def repeat(self):
+        if self.error is not None:
+            raise self.error
+        self.frames.put(REPEAT)
+
+    # Flush the queued frames and close the file
+    def release(self):
+        if self.thread.is_alive():
+            self.frames.put(None)
+            self.thread.join()
+        self.writer.release()
+        if self.error is not None:
+            raise self.error
+
+
+class FramePool:
+    """
+    Preallocated frame buffers shared by the frame loop and the encoder.
+    take() hands out a free buffer, waiting for the encoder to give one
+    back when all are in flight, so a running render allocates no frames.
+    The default size covers a full encoder queue, the frame being encoded,
+    the last encoded frame (kept for repeats) and the frame being drawn.
+    """
+
+    def __init__(self, frame_shape, size=QUEUE_SIZE + 3):
+        self.free = queue.Queue()
+        for _ in range(size):
+            self.free.put(np.empty(frame_shape, dtype=np.uint8))
+
+    def take(self):
+        return self.free.get()
+
+    def give(self, frame):
+        self.free.put(frame)
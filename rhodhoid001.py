@@ -1,64 +1,19 @@
-import cv2
-import numpy as np
 import math
-import random
+
+from curvas.registry import get_curve
+from curvas.render import render
+from curvas.seeds import new_seed, seeded_parameters
 
 # Video settings
-width, height = 1920, 1080  # Resolution
 fps = 60                   # Frames per second
 duration = 10              # Duration in seconds
-output_file = 'rose_curve.mp4'
-
-# Video writer setup
-fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-video_writer = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
-
-# Time and scale settings
-t_max = duration * fps     # Total number of frames
-scale = 300                # Scale factor for curve rendering
-center = (width // 2, height // 2)
-
-# Randomize Rose curve parameters
-k = random.randint(1, 10)           # Number of petals (integer)
-a = random.uniform(50, 300)         # Scale of the curve
-
-# Function to compute Rose curve coordinates
-def rose_curve(t):
-    t = t / 60.0  # Adjust for smooth progression
-    r = a * math.cos(k * t)
-    x = r * math.cos(t)
-    y = r * math.sin(t)
-    return x, y
-
-# Framebuffer
-previous_point = None
-for i in range(t_max):
-    frame = np.ones((height, width, 3), dtype=np.uint8) * 255  # White background
-    
-    for t in np.linspace(0, 2 * math.pi * k, num=i):
-        x, y = rose_curve(t)
-        x_pixel = int(center[0] + x)
-        y_pixel = int(center[1] - y)
-        
-        if 0 <= x_pixel < width and 0 <= y_pixel < height:
-            if previous_point is not None:
-                cv2.line(frame, previous_point, (x_pixel, y_pixel), (0, 0, 0), 1)  # Draw black line
-            previous_point = (x_pixel, y_pixel)
-        else:
-            previous_point = None
-
-    # Draw axes
-    cv2.line(frame, (0, center[1]), (width, center[1]), (200, 200, 200), 1)
-    cv2.line(frame, (center[0], 0), (center[0], height), (200, 200, 200), 1)
+seed = new_seed()          # Printed in the file name to render it again
+output_file = f'rose_curve_{seed}.mp4'
 
-    # Display the frame
-    cv2.imshow('Rose Curve', frame)
-    video_writer.write(frame)
-    
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
+# Random Rose curve parameters: k petals (integer) and scale a
+params = seeded_parameters(get_curve('rose'), seed)
+k = params['k']
 
-# Clean up
-video_writer.release()
-cv2.destroyAllWindows()
-print(f'Video saved as {output_file}')
+render('rose', fps=fps, duration=duration, style='reveal', params=params,
+       t_step=2 * math.pi * k / 60.0 / (duration * fps),  # Reveal up to t = 2*pi*k/60
+       output_file=output_file)